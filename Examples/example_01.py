@@ -13,14 +13,15 @@ Note: Uses the NREL 5MW included in the Test Cases and is a part of the OpenFAST
 '''
 
 # Python Modules
-import yaml, os
+import os
 # ROSCO Modules
 from ROSCO_toolbox import turbine as ROSCO_turbine
+from ROSCO_toolbox.utilities import load_yaml
 
 # Load yaml file
 this_dir = os.path.dirname(os.path.abspath(__file__))
 parameter_filename = os.path.join(this_dir,'NREL5MW_example.yaml')
-inps = yaml.safe_load(open(parameter_filename))
+inps = load_yaml(parameter_filename)
 path_params         = inps['path_params']
 turbine_params      = inps['turbine_params']
 
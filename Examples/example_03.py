@@ -10,10 +10,10 @@ In this example:
 - Write a text file with rotor performance properties
 '''
 # Python modules
-import yaml, os 
+import os 
 # ROSCO toolbox modules 
 from ROSCO_toolbox import turbine as ROSCO_turbine
-from ROSCO_toolbox.utilities import write_rotor_performance
+from ROSCO_toolbox.utilities import write_rotor_performance, load_yaml
 # Initialize parameter dictionaries
 turbine_params = {}
 control_params = {}
@@ -25,7 +25,7 @@ if not os.path.isdir(example_out_dir):
 
 # Load yaml file
 parameter_filename = os.path.join(this_dir,'NREL5MW_example.yaml')
-inps = yaml.safe_load(open(parameter_filename))
+inps = load_yaml(parameter_filename)
 path_params         = inps['path_params']
 turbine_params      = inps['turbine_params']
 controller_params   = inps['controller_params']
@@ -12,17 +12,17 @@ In this example:
 '''
 # Python modules
 import matplotlib.pyplot as plt 
-import yaml, os 
+import os 
 # ROSCO toolbox modules 
 from ROSCO_toolbox import controller as ROSCO_controller
 from ROSCO_toolbox import turbine as ROSCO_turbine
 from ROSCO_toolbox import sim as ROSCO_sim
-from ROSCO_toolbox.utilities import write_DISCON
+from ROSCO_toolbox.utilities import write_DISCON, load_yaml
 
 # Load yaml file 
 this_dir = os.path.dirname(os.path.abspath(__file__))
 parameter_filename = os.path.join(this_dir,'NREL5MW_example.yaml')
-inps = yaml.safe_load(open(parameter_filename))
+inps = load_yaml(parameter_filename)
 path_params         = inps['path_params']
 turbine_params      = inps['turbine_params']
 controller_params   = inps['controller_params']
@@ -11,19 +11,18 @@ In this example:
 Note - you will need to have a compiled controller in ROSCO/build/ 
 '''
 # Python Modules
-import yaml
 import os
 # ROSCO toolbox modules 
 from ROSCO_toolbox import controller as ROSCO_controller
 from ROSCO_toolbox import turbine as ROSCO_turbine
-from ROSCO_toolbox.utilities import write_DISCON, run_openfast
+from ROSCO_toolbox.utilities import write_DISCON, run_openfast, load_yaml
 from ROSCO_toolbox import sim as ROSCO_sim
 
 this_dir = os.path.dirname(os.path.abspath(__file__))
 
 # Load yaml file 
 parameter_filename = os.path.join(os.path.dirname(this_dir), 'Tune_Cases', 'IEA15MW.yaml') 
-inps = yaml.safe_load(open(parameter_filename))
+inps = load_yaml(parameter_filename)
 path_params         = inps['path_params']
 turbine_params      = inps['turbine_params']
 controller_params   = inps['controller_params']
@@ -12,11 +12,12 @@ In this example:
 
 # Python modules
 import matplotlib.pyplot as plt 
-import yaml, os
+import os
 # ROSCO toolbox modules 
 from ROSCO_toolbox import controller as ROSCO_controller
 from ROSCO_toolbox import turbine as ROSCO_turbine
 from ROSCO_toolbox import sim as ROSCO_sim
+from ROSCO_toolbox.utilities import load_yaml
 
 this_dir = os.path.dirname(__file__)
 example_out_dir = os.path.join(this_dir,'examples_out')
@@ -25,7 +26,7 @@ if not os.path.isdir(example_out_dir):
 
 # Load yaml file 
 parameter_filename = os.path.join(this_dir,'NREL5MW_example.yaml')
-inps = yaml.safe_load(open(parameter_filename))
+inps = load_yaml(parameter_filename)
 path_params         = inps['path_params']
 turbine_params      = inps['turbine_params']
 controller_params   = inps['controller_params']
@@ -16,16 +16,17 @@ Note: You will need a turbine model with DAC capabilites in order to run this.
 '''
 
 # Python Modules
-import yaml, os
+import os
 # ROSCO Modules
 from ROSCO_toolbox import turbine as ROSCO_turbine
 from ROSCO_toolbox import controller as ROSCO_controller
+from ROSCO_toolbox.utilities import load_yaml
 
 this_dir =  os.path.dirname(os.path.abspath(__file__))
 
 # Load yaml file
 parameter_filename = os.path.join(os.path.dirname(this_dir),'Tune_Cases/BAR.yaml')
-inps = yaml.safe_load(open(parameter_filename))
+inps = load_yaml(parameter_filename)
 path_params         = inps['path_params']
 turbine_params      = inps['turbine_params']
 controller_params   = inps['controller_params']
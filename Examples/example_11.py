@@ -10,19 +10,19 @@ In this example:
 
 '''
 # Python Modules
-import yaml
 import os
 # ROSCO toolbox modules 
 from ROSCO_toolbox import controller as ROSCO_controller
 from ROSCO_toolbox import turbine as ROSCO_turbine
 from ROSCO_toolbox import sim as ROSCO_sim
+from ROSCO_toolbox.utilities import load_yaml
 
 import numpy as np
 
 # Load yaml file 
 parameter_filename = os.path.join( os.path.dirname( os.path.dirname( os.path.realpath(__file__) )), 
                                  'Tune_Cases', 'IEA15MW.yaml')
-inps = yaml.safe_load(open(parameter_filename))
+inps = load_yaml(parameter_filename)
 path_params         = inps['path_params']
 turbine_params      = inps['turbine_params']
 controller_params   = inps['controller_params']
@@ -0,0 +1,80 @@
+'''
+----------- Example_12 --------------
+Run a batch of open loop simulations
+-------------------------------------
+
+In this example:
+  - Load turbine from saved pickle
+  - Run a simple step wind simulation, as in example_05
+  - Replay its blade pitch and generator torque through a batch of open loop simulations
+  - Run open loop simulations of steady winds with a fixed pitch and torque, and plot them
+
+Notes - You will need to have a compiled controller in ROSCO, and
+        properly point to it in the `lib_name` variable.
+      - The open loop simulations run in parallel when numba is installed.
+'''
+# Python modules
+import matplotlib.pyplot as plt
+import numpy as np
+import os, platform
+# ROSCO toolbox modules
+from ROSCO_toolbox import turbine as ROSCO_turbine
+from ROSCO_toolbox import sim as ROSCO_sim
+from ROSCO_toolbox import control_interface as ROSCO_ci
+
+# Specify controller dynamic library path and name
+this_dir = os.path.dirname(os.path.abspath(__file__))
+example_out_dir = os.path.join(this_dir,'examples_out')
+if not os.path.isdir(example_out_dir):
+  os.makedirs(example_out_dir)
+
+if platform.system() == 'Windows':
+    lib_name = os.path.join(this_dir, '../ROSCO/build/libdiscon.dll')
+elif platform.system() == 'Darwin':
+    lib_name = os.path.join(this_dir, '../ROSCO/build/libdiscon.dylib')
+else:
+    lib_name = os.path.join(this_dir, '../ROSCO/build/libdiscon.so')
+
+param_filename = os.path.join(this_dir,'DISCON.IN')
+
+# Load turbine model from saved pickle
+turbine = ROSCO_turbine.Turbine
+turbine = turbine.load(os.path.join(example_out_dir,'01_NREL5MW_saved.p'))
+
+# Load controller library
+controller_int = ROSCO_ci.ControllerInterface(lib_name,param_filename=param_filename)
+
+# Load the simulator
+sim = ROSCO_sim.Sim(turbine,controller_int)
+
+# Define a wind speed history
+dt = 0.1
+tlen = 400      # length of time to simulate (s)
+ws0 = 7         # initial wind speed (m/s)
+t = np.arange(0,tlen,dt)
+ws = ws0 + t//100   # add steps at every 100s
+
+# Run the closed loop simulation
+sim.sim_ws_series(t,ws,rotor_rpm_init=4,make_plots=False)
+
+# Replaying the controller's pitch and torque open loop gives the same rotor speeds
+rot_speed, aero_torque = sim.sim_open_loop_batch(t, np.vstack([ws, ws]), sim.bld_pitch, sim.gen_torque, rotor_rpm_init=4)
+assert np.allclose(rot_speed, sim.rot_speed, rtol=1e-10, atol=0.0), 'Open loop replay does not match the closed loop simulation'
+
+# Steady winds with the blade pitch and generator torque held at their final values
+ws_steady = np.arange(4.0, 12.5, 0.5)
+ws_batch = np.ones((len(ws_steady), len(t))) * ws_steady[:,None]
+rot_speed, aero_torque = sim.sim_open_loop_batch(t, ws_batch, sim.bld_pitch[-1], sim.gen_torque[-1], rotor_rpm_init=4)
+
+fig, ax = plt.subplots(1,1)
+for ws_k, rot_speed_k in zip(ws_steady, rot_speed):
+    ax.plot(t, rot_speed_k, label='{} m/s'.format(ws_k))
+ax.set_xlabel('Time (s)')
+ax.set_ylabel('Rot Speed (rad/s)')
+ax.legend(ncol=2, fontsize='small')
+ax.grid()
+
+if False:
+  plt.show()
+else:
+  plt.savefig(os.path.join(example_out_dir,'12_NREL5MW_OpenLoop.png'))
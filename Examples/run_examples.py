@@ -54,6 +54,7 @@ all_scripts = [
     'example_09',
     'example_10',
     'example_11',
+    'example_12',
     
 ]
 
@@ -91,6 +92,9 @@ class TestExamples(unittest.TestCase):
 
     def test_example_11(self):
         run_all_scripts("example_11", all_scripts)
+
+    def test_example_12(self):
+        run_all_scripts("example_12", all_scripts)
                     
 
 
@@ -20,12 +20,14 @@ import multiprocessing as mp
 import ROSCO_toolbox.ofTools.fast_io.read_fast_input as fast_io
 from ROSCO_toolbox.ofTools.fast_io.FAST_reader import InputReader_OpenFAST
 from ROSCO_toolbox.ofTools.case_gen.CaseGen_IEC import CaseGen_IEC
-from ROSCO_toolbox.ofTools.case_gen.runFAST_pywrapper import runFAST_pywrapper_batch
+from ROSCO_toolbox.ofTools.case_gen.runFAST_pywrapper import runFAST_pywrapper_batch, eval_multi
 from matplotlib.backends.backend_pdf import FigureCanvasPdf, PdfPages
 from ROSCO_toolbox.ofTools.fast_io import output_processing
 import matplotlib.pyplot as plt
 
 
+# Parsed OpenFAST models, shared between test runs of the same turbine
+_fast_input_cache = {}
 
 class ROSCO_testing():
     '''
@@ -55,6 +57,7 @@ class ROSCO_testing():
         self.mpi_comm_map_down = []
         self.outfile_fmt = 2 # 1 = .txt, 2 = binary, 3 = both
         self.comp_dir = None
+        self._batch_queue = None    # batches waiting to run, used for parallel controller comparisons
 
         # Setup turbine parameters 
         #  - Default to NREL 5MW 
@@ -91,6 +94,28 @@ class ROSCO_testing():
 
         super(ROSCO_testing, self).__init__()
 
+    def _read_fast_inputs(self):
+        '''
+        Read the OpenFAST model used to generate test cases. The parsed model is
+        cached, so comparisons of several controllers only read it once.
+
+        Returns:
+        --------
+        fst_vt: dict
+            OpenFAST input dictionary, from InputReader_OpenFAST
+        '''
+        key = (os.path.realpath(self.FAST_directory), self.FAST_InputFile, self.FAST_ver, self.dev_branch)
+        if key not in _fast_input_cache:
+            fastRead = InputReader_OpenFAST(
+                FAST_ver=self.FAST_ver, dev_branch=self.dev_branch)
+            fastRead.FAST_InputFile = self.FAST_InputFile   # FAST input file (ext=.fst)
+            # Path to fst directory files
+            fastRead.FAST_directory = self.FAST_directory
+            fastRead.execute()
+            _fast_input_cache[key] = fastRead.fst_vt
+
+        return _fast_input_cache[key]
+
     def ROSCO_Test_lite(self, more_case_inputs={}, U=[]):
         '''
         DLC 1.1 - 5 wind speeds, 60s
@@ -114,28 +139,22 @@ class ROSCO_testing():
         else:
             WindSpeeds = [5, 8, 11, 14, 17]
 
-        fastRead = InputReader_OpenFAST(
-            FAST_ver=self.FAST_ver, dev_branch=self.dev_branch)
-        fastRead.FAST_InputFile =  self.FAST_InputFile   # FAST input file (ext=.fst)
-        # Path to fst directory files
-        fastRead.FAST_directory = self.FAST_directory
-
         # Read FAST inputs for generating cases
-        fastRead.execute()
+        fst_vt = self._read_fast_inputs()
 
         # Start near the steady state, controller should be able to handle startup transients.
         iec = CaseGen_IEC()
         iec.init_cond[("ElastoDyn", "RotSpeed")] = {'U':  [2, 30]}
         iec.init_cond[("ElastoDyn", "RotSpeed")]['val'] = np.ones(
-            [2]) * fastRead.fst_vt['ElastoDyn']['RotSpeed'] * .75
+            [2]) * fst_vt['ElastoDyn']['RotSpeed'] * .75
         iec.init_cond[("ElastoDyn", "BlPitch1")] = {'U':  [2, 30]}
         iec.init_cond[("ElastoDyn", "BlPitch1")]['val'] = np.ones([2]) * 0
         iec.init_cond[("ElastoDyn", "BlPitch2")] = iec.init_cond[("ElastoDyn", "BlPitch1")]
         iec.init_cond[("ElastoDyn", "BlPitch3")] = iec.init_cond[("ElastoDyn", "BlPitch1")]
         iec.Turbine_Class = self.Turbine_Class
         iec.Turbulence_Class = self.Turbulence_Class
-        iec.D = fastRead.fst_vt['ElastoDyn']['TipRad']*2.
-        iec.z_hub = fastRead.fst_vt['InflowWind']['RefHt']
+        iec.D = fst_vt['ElastoDyn']['TipRad']*2.
+        iec.z_hub = fst_vt['InflowWind']['RefHt']
         iec.TMax = self.TMax
 
         iec.dlc_inputs = {}
@@ -236,13 +255,7 @@ class ROSCO_testing():
         outFileThere = [os.path.exists(outFileName) for outFileName in outFileNames]
 
         # Run simulations if they're not all there or if you want to overwrite
-        if not all(outFileThere) or self.overwrite:
-            if self.cores > 1:
-                fastBatch.run_multi(self.cores)
-            else:
-                fastBatch.run_serial()
-
-        self.print_results(outFileNames)
+        self._run_batch(fastBatch, not all(outFileThere) or self.overwrite, outFileNames)
 
 
     def ROSCO_Test_heavy(self, more_case_inputs={}, U=[]):
@@ -270,20 +283,14 @@ class ROSCO_testing():
         else:
             WindSpeeds = [[4, 6, 8, 10, 12, 14, 16, 18, 20, 22, 24], [8.88, 12.88]]
 
-        fastRead = InputReader_OpenFAST(
-            FAST_ver=self.FAST_ver, dev_branch=self.dev_branch)
-        fastRead.FAST_InputFile = self.FAST_InputFile   # FAST input file (ext=.fst)
-        # Path to fst directory files
-        fastRead.FAST_directory = self.FAST_directory
-
         # Read FAST inputs for generating cases
-        fastRead.execute()
+        fst_vt = self._read_fast_inputs()
 
         # Start near the steady state, controller should be able to handle startup transients.
         iec = CaseGen_IEC()
         iec.init_cond[("ElastoDyn", "RotSpeed")] = {'U':  [2, 30]}
         iec.init_cond[("ElastoDyn", "RotSpeed")]['val'] = np.ones(
-            [2]) * fastRead.fst_vt['ElastoDyn']['RotSpeed'] * .75
+            [2]) * fst_vt['ElastoDyn']['RotSpeed'] * .75
         iec.init_cond[("ElastoDyn", "BlPitch1")] = {'U':  [2, 30]}
         iec.init_cond[("ElastoDyn", "BlPitch1")]['val'] = np.ones([2]) * 0
         iec.init_cond[("ElastoDyn", "BlPitch2")] = iec.init_cond[("ElastoDyn", "BlPitch1")]
@@ -298,8 +305,8 @@ class ROSCO_testing():
 
         iec.Turbine_Class = self.Turbine_Class
         iec.Turbulence_Class = self.Turbulence_Class
-        iec.D = fastRead.fst_vt['ElastoDyn']['TipRad']*2.
-        iec.z_hub = fastRead.fst_vt['InflowWind']['RefHt']
+        iec.D = fst_vt['ElastoDyn']['TipRad']*2.
+        iec.z_hub = fst_vt['InflowWind']['RefHt']
         iec.TMax = self.TMax
 
         iec.dlc_inputs = {}
@@ -401,7 +408,27 @@ class ROSCO_testing():
         outFileThere = [os.path.exists(outFileName) for outFileName in outFileNames]
 
         # Run simulations if they're not all there or if you want to overwrite
-        if not all(outFileThere) or self.overwrite:
+        self._run_batch(fastBatch, not all(outFileThere) or self.overwrite, outFileNames)
+
+    def _run_batch(self, fastBatch, run_sims, outFileNames):
+        '''
+        Run a batch of OpenFAST simulations and print their results. If a controller
+        comparison is running in parallel, the batch is queued instead, see _run_queued_batches.
+
+        Parameters:
+        -----------
+        fastBatch: runFAST_pywrapper_batch
+            batch of simulations for one controller
+        run_sims: bool
+            run the simulations? False if the outputs already exist
+        outFileNames: list
+            OpenFAST output files of the batch
+        '''
+        if self._batch_queue is not None:
+            self._batch_queue.append((fastBatch, run_sims, outFileNames))
+            return
+
+        if run_sims:
             if self.cores > 1:
                 fastBatch.run_multi(self.cores)
             else:
@@ -409,6 +436,31 @@ class ROSCO_testing():
 
         self.print_results(outFileNames)
 
+    def _run_queued_batches(self):
+        '''
+        Run all queued batches in a single multiprocessing pool, so simulations of 
+        different controllers run in parallel rather than one controller at a time.
+        '''
+        batches, self._batch_queue = self._batch_queue, None
+
+        # Each controller has its own run directory, so the cases won't collide
+        case_data_all = []
+        for fastBatch, run_sims, _ in batches:
+            if run_sims:
+                if not os.path.exists(fastBatch.FAST_runDirectory):
+                    os.makedirs(fastBatch.FAST_runDirectory)
+                case_data_all.extend(fastBatch.create_case_data())
+
+        if case_data_all:
+            pool = mp.Pool(min(self.cores, len(case_data_all)))
+            pool.map(eval_multi, case_data_all)
+            pool.close()
+            pool.join()
+
+        for fastBatch, _, outFileNames in batches:
+            self.runDir = fastBatch.FAST_runDirectory   # results are saved in each controller's run directory
+            self.print_results(outFileNames)
+
     def ROSCO_Controller_Comp(self, controller_paths, testtype='light', more_case_inputs={}, U=[]):
         '''
         Heavy or light testing for n controllers, n = len(controller_paths)
@@ -423,23 +475,35 @@ class ROSCO_testing():
         # Save initial run directory
         run_dir_init = self.runDir
         wind_dir_init = self.wind_dir
-        for ci, path in enumerate(controller_paths):
-            # specify rosco path
-            self.rosco_path = path
-            # temporarily change run directories
-            self.runDir = os.path.join(run_dir_init,'controller_{}'.format(ci)) # specific directory for each controller
-            self.wind_dir = os.path.join(run_dir_init, 'wind')  # wind in base runDir
-
-            if testtype.lower() == 'light':
-                self.ROSCO_Test_lite(more_case_inputs=more_case_inputs, U=U)
-            elif testtype.lower() == 'heavy':
-                self.ROSCO_Test_heavy()
-            else:
-                raise ValueError('{} is an invalid testtype for controller comparison'.format(testtype))
 
-        # reset self
-        self.runDir = run_dir_init
-        self.wind_dir = wind_dir_init
+        # Set up all controllers first, then run them together
+        if self.cores > 1 and not self.mpi_run:
+            self._batch_queue = []
+
+        try:
+            for ci, path in enumerate(controller_paths):
+                # specify rosco path
+                self.rosco_path = path
+                # temporarily change run directories
+                self.runDir = os.path.join(run_dir_init,'controller_{}'.format(ci)) # specific directory for each controller
+                self.wind_dir = os.path.join(run_dir_init, 'wind')  # wind in base runDir
+
+                if testtype.lower() == 'light':
+                    self.ROSCO_Test_lite(more_case_inputs=more_case_inputs, U=U)
+                elif testtype.lower() == 'heavy':
+                    self.ROSCO_Test_heavy()
+                else:
+                    raise ValueError('{} is an invalid testtype for controller comparison'.format(testtype))
+
+            if self._batch_queue is not None:
+                self._run_queued_batches()
+        finally:
+            # Don't leave the queue on if the setup failed, later tests would never run
+            self._batch_queue = None
+
+            # reset self
+            self.runDir = run_dir_init
+            self.wind_dir = wind_dir_init
     
     def ROSCO_DISCON_Comp(self, DISCON_filenames, testtype='light', more_case_inputs={}, U=[]):
         '''
@@ -456,25 +520,37 @@ class ROSCO_testing():
         # Save initial run directory
         run_dir_init = self.runDir
         wind_dir_init = self.wind_dir
-        for ci, discon in enumerate(DISCON_filenames):
-            # temporarily change run directories
-            self.runDir = os.path.join(run_dir_init, 'controller_{}'.format(ci))
-            self.wind_dir = os.path.join(run_dir_init, 'wind')  # wind in base runDir
-
-            # Point to different DISCON.IN files using more_case_inputs
-            more_case_inputs[('ServoDyn', 'DLL_InFile')] = {'vals': [discon], 'group': 0}
-            self.wind_dir = os.path.join(run_dir_init, 'wind')  # wind in base runDir
-
-            if testtype.lower() == 'light':
-                self.ROSCO_Test_lite(more_case_inputs=more_case_inputs, U=U)
-            elif testtype.lower() == 'heavy':
-                self.ROSCO_Test_heavy(more_case_inputs=more_case_inputs, U=U)
-            else:
-                raise ValueError('{} is an invalid testtype for DISCON comparison'.format(testtype))
 
-        # reset self
-        self.runDir = run_dir_init
-        self.wind_dir = wind_dir_init
+        # Set up all controllers first, then run them together
+        if self.cores > 1 and not self.mpi_run:
+            self._batch_queue = []
+
+        try:
+            for ci, discon in enumerate(DISCON_filenames):
+                # temporarily change run directories
+                self.runDir = os.path.join(run_dir_init, 'controller_{}'.format(ci))
+                self.wind_dir = os.path.join(run_dir_init, 'wind')  # wind in base runDir
+
+                # Point to different DISCON.IN files using more_case_inputs
+                more_case_inputs[('ServoDyn', 'DLL_InFile')] = {'vals': [discon], 'group': 0}
+                self.wind_dir = os.path.join(run_dir_init, 'wind')  # wind in base runDir
+
+                if testtype.lower() == 'light':
+                    self.ROSCO_Test_lite(more_case_inputs=more_case_inputs, U=U)
+                elif testtype.lower() == 'heavy':
+                    self.ROSCO_Test_heavy(more_case_inputs=more_case_inputs, U=U)
+                else:
+                    raise ValueError('{} is an invalid testtype for DISCON comparison'.format(testtype))
+
+            if self._batch_queue is not None:
+                self._run_queued_batches()
+        finally:
+            # Don't leave the queue on if the setup failed, later tests would never run
+            self._batch_queue = None
+
+            # reset self
+            self.runDir = run_dir_init
+            self.wind_dir = wind_dir_init
 
     def print_results(self,outfiles):
 
@@ -94,7 +94,7 @@ if __name__ == "__main__":
     rt_kwargs['dev_branch'] = True                  # dev branch of Openfast?
     rt_kwargs['debug_level']= 2                     # debug level. 0 - no outputs, 1 - minimal outputs, 2 - all outputs
     rt_kwargs['overwrite']  = False                 # overwite fast sims?
-    rt_kwargs['cores']      = 36                     # number of cores if multiprocessing
+    rt_kwargs['cores']      = os.cpu_count()         # number of cores if multiprocessing
     rt_kwargs['mpi_run']    = False                 # run using mpi
     rt_kwargs['mpi_comm_map_down'] = []             # core mapping for MPI
     rt_kwargs['outfile_fmt'] = 2                    # 1 = .txt, 2 = binary, 3 = both
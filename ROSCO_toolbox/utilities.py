@@ -19,6 +19,7 @@ write_DISCON
 read_DISCON
 write_rotor_performance
 load_from_txt
+load_yaml
 DISCON_dict
 """
 import datetime
@@ -29,8 +30,15 @@ from matplotlib import transforms
 from itertools import takewhile, product
 import struct
 import subprocess
+import yaml
 import ROSCO_toolbox
 
+# Use the libyaml based parser, if PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Some useful constants
 now = datetime.datetime.now()
 pi = np.pi
@@ -333,6 +341,18 @@ def load_from_txt(txt_filename):
         return pitch_initial_rad, TSR_initial, Cp, Ct, Cq
 
 
+def load_yaml(yaml_filename):
+    '''
+    Load a .yaml input file, e.g. the turbine and controller tuning parameters.
+
+    Parameters:
+    -----------
+        yaml_filename: str
+                       Filename of the .yaml file
+    '''
+    with open(yaml_filename) as yfile:
+        return yaml.load(yfile, Loader=SafeLoader)
+
 def DISCON_dict(turbine, controller, txt_filename=None):
     '''
     Convert the turbine and controller objects to a dictionary organized by the parameter names 
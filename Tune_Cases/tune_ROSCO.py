@@ -18,18 +18,17 @@ parameter_filename  = os.path.join(this_dir,'NREL5MW.yaml')
 #------------------------------------- INITIALIZATION ----------------------------------#
 # Import python modules
 import matplotlib.pyplot as plt 
-import yaml 
 # Import ROSCO_toolbox modules 
 from ROSCO_toolbox import controller as ROSCO_controller
 from ROSCO_toolbox import turbine as ROSCO_turbine
-from ROSCO_toolbox.utilities import write_rotor_performance, write_DISCON
+from ROSCO_toolbox.utilities import write_rotor_performance, write_DISCON, load_yaml
 
 # Initialize parameter dictionaries
 turbine_params = {}
 control_params = {}
 
 # Load input file contents, put them in some dictionaries to keep things cleaner
-inps = yaml.safe_load(open(parameter_filename))
+inps = load_yaml(parameter_filename)
 path_params = inps['path_params']
 turbine_params = inps['turbine_params']
 controller_params = inps['controller_params']
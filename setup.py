@@ -40,7 +40,7 @@ DESCRIPTION = 'A toolbox for development of wind turbine controllers.'
 URL = 'https://github.com/NREL/ROSCO_toolbox'
 EMAIL = 'nikhar.abbas@nrel.gov'
 AUTHOR = 'NREL National Wind Technology Center'
-REQUIRES_PYTHON = '>=3.4'
+REQUIRES_PYTHON = '>=3.7'
 VERSION = '2.3.0'
 
 # These packages are required for all of the code to be executed. 
@@ -61,6 +61,9 @@ EXTRAS = {
         'readthedocs-sphinx-ext>=0.5.15',
         'Sphinx>=2.0',
         'sphinxcontrib-napoleon>=0.7'
+    },
+    'sim': {
+        'numba>=0.50'
     }
 }
 
@@ -116,6 +119,9 @@ class CMakeBuildExt(build_ext):
             self.spawn(['cmake', '--build', self.build_temp, '--target', 'install', '--config', 'Release'])
 
         else:
+            # numba.pycc extensions compile their object files before linking
+            if hasattr(ext, '_prepare_object_files'):
+                ext._prepare_object_files(self)
             super().build_extension(ext)
 
 
@@ -205,5 +211,15 @@ metadata = dict(
 if "--compile-rosco" in sys.argv:
     metadata['ext_modules'] = [roscoExt]
     sys.argv.remove("--compile-rosco")
+if "--compile-sim" in sys.argv:
+    # Ahead-of-time compiled simulator step kernel, ROSCO_toolbox/sim_aot.py
+    #       -- numba and the toolbox requirements must already be installed to build it
+    try:
+        from ROSCO_toolbox.sim_aot import cc as simCC
+    except ImportError as e:
+        raise RuntimeError('--compile-sim needs numba and the ROSCO_toolbox requirements installed first, '
+                           'e.g. pip install numba ({})'.format(e))
+    metadata['ext_modules'] = metadata.get('ext_modules', []) + [simCC.distutils_extension()]
+    sys.argv.remove("--compile-sim")
 
 setup(**metadata)